@@ -0,0 +1,225 @@
+"""
+벤치마크용 로컬 가짜 서버 (KIS REST / Gemini API / Telegram Bot API).
+
+각 서버는 127.0.0.1의 임의 포트에서 스레드로 동작하며,
+latency_ms 만큼 응답을 지연시켜 실제 네트워크 왕복 시간을 흉내낸다.
+
+    with FakeKisServer(latency_ms=30) as kis:
+        os.environ["KIS_BASE_URL"] = kis.url
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str):
+        fake = self.server.fake
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        fake.record_request()
+        if fake.latency_ms:
+            time.sleep(fake.latency_ms / 1000)
+
+        status, payload = fake.handle(method, urlparse(self.path).path, body)
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # 요청마다 stderr 출력 방지
+
+
+class FakeServer:
+    """ThreadingHTTPServer 기반 가짜 서버. 하위 클래스는 handle()만 구현."""
+
+    def __init__(self, latency_ms: float = 0):
+        self.latency_ms = latency_ms
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+        self.url = None
+
+    def handle(self, method: str, path: str, body: bytes) -> tuple[int, dict]:
+        raise NotImplementedError
+
+    def record_request(self) -> None:
+        with self._count_lock:
+            self.request_count += 1
+
+    def start(self) -> "FakeServer":
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        return self
+
+    def stop(self) -> None:
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ============================================================
+# KIS OpenAPI
+# ============================================================
+KIS_INDEX_RESPONSE = {
+    "rt_cd": "0",
+    "msg_cd": "MCA00000",
+    "msg1": "정상처리 되었습니다.",
+    "output1": {
+        "bstp_nmiv_prpr": "5507.01",
+        "bstp_nmiv_prdy_vrss": "42.13",
+        "bstp_nmiv_prdy_ctrt": "0.77",
+        "acml_vol": "412345678",
+        "acml_tr_pbmn": "12345678901234",
+    },
+    "output2": [
+        {
+            "stck_bsop_date": f"202602{day:02d}",
+            "bstp_nmiv_prpr": f"{5400 + day * 5}.00",
+            "bstp_nmiv_oprc": f"{5390 + day * 5}.00",
+            "bstp_nmiv_hgpr": f"{5420 + day * 5}.00",
+            "bstp_nmiv_lwpr": f"{5380 + day * 5}.00",
+            "acml_vol": "400000000",
+        }
+        for day in range(1, 31)
+    ],
+}
+
+KIS_INVESTOR_RESPONSE = {
+    "rt_cd": "0",
+    "msg_cd": "MCA00000",
+    "msg1": "정상처리 되었습니다.",
+    "output": [
+        {
+            "stck_bsop_date": f"202602{day:02d}",
+            "prsn_ntby_qty": "-1523000",
+            "frgn_ntby_qty": "2104000",
+            "orgn_ntby_qty": "-581000",
+            "prsn_ntby_tr_pbmn": "-152300",
+            "frgn_ntby_tr_pbmn": "210400",
+            "orgn_ntby_tr_pbmn": "-58100",
+        }
+        for day in range(1, 31)
+    ],
+}
+
+
+class FakeKisServer(FakeServer):
+    """토큰 발급, 업종 지수, 투자자별 매매동향 엔드포인트."""
+
+    def handle(self, method, path, body):
+        if path == "/oauth2/tokenP":
+            return 200, {
+                "access_token": "bench-token",
+                "token_type": "Bearer",
+                "expires_in": 86400,
+                "access_token_token_expired": "2099-12-31 23:59:59",
+            }
+        if path.endswith("/inquire-daily-index-chartprice"):
+            return 200, KIS_INDEX_RESPONSE
+        if path.endswith("/inquire-investor"):
+            return 200, KIS_INVESTOR_RESPONSE
+        return 404, {"rt_cd": "1", "msg1": f"unknown path {path}"}
+
+
+# ============================================================
+# Gemini API (generateContent)
+# ============================================================
+ANALYST_TEXT = (
+    "- **Market Sentiment:** 68/100 (Bull)\n"
+    "- **Key Insight:** 외국인 현물 순매수 지속, 반도체 대형주 주도\n"
+    "- **Hot Sector:** 반도체 (삼성전자, SK하이닉스)\n"
+) * 8
+
+QUANT_TEXT = "```json\n" + json.dumps(
+    [
+        {
+            "ticker": f"{i:06d}",
+            "name": f"종목{i}",
+            "action": ["NEW", "HOLD", "MODIFY", "CANCEL"][i % 4],
+            "entry_price": 70000 + i * 100,
+            "target_price": 74000 + i * 100,
+            "stop_loss": 68500 + i * 100,
+            "reason": "외국인 수급 지속 유입으로 목표가 상향 조정",
+        }
+        for i in range(10)
+    ],
+    ensure_ascii=False,
+    indent=2,
+) + "\n```"
+
+RISK_TEXT = "✅ [승인] 삼성전자 신규 진입 — 손익비 2.7, 비중 10%\n" * 5
+
+
+class FakeGeminiServer(FakeServer):
+    """models/*:generateContent. 프롬프트 내용으로 Analyst/Quant/Risk 응답을 구분."""
+
+    def handle(self, method, path, body):
+        if not path.endswith(":generateContent"):
+            return 404, {"error": {"code": 404, "message": f"unknown path {path}"}}
+
+        request = json.loads(body or b"{}")
+        prompt = "".join(
+            part.get("text", "")
+            for content in request.get("contents", [])
+            for part in content.get("parts", [])
+        )
+        if "## Previous Orders" in prompt:
+            text = QUANT_TEXT
+        elif "## Proposed Orders" in prompt:
+            text = RISK_TEXT
+        else:
+            text = ANALYST_TEXT
+
+        return 200, {
+            "candidates": [
+                {
+                    "content": {"role": "model", "parts": [{"text": text}]},
+                    "finishReason": "STOP",
+                    "index": 0,
+                }
+            ],
+            "usageMetadata": {"promptTokenCount": len(prompt) // 4, "candidatesTokenCount": len(text) // 4},
+        }
+
+
+# ============================================================
+# Telegram Bot API
+# ============================================================
+class FakeTelegramServer(FakeServer):
+    """bot<token>/sendMessage."""
+
+    def handle(self, method, path, body):
+        if path.endswith("/sendMessage"):
+            message = json.loads(body or b"{}")
+            return 200, {
+                "ok": True,
+                "result": {"message_id": self.request_count, "chat": {"id": message.get("chat_id")}, "text": message.get("text")},
+            }
+        return 404, {"ok": False, "description": "Not Found"}
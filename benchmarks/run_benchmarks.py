@@ -0,0 +1,388 @@
+"""
+파이프라인 핫패스 벤치마크.
+
+KIS / Gemini / Telegram을 로컬 가짜 서버(benchmarks/fake_servers.py)로 대체하고
+지연(--latency-ms)을 주입한 상태에서 다음을 측정한다.
+
+- run_pipeline          : Analyst → Quant → Risk → Telegram 전체 지연 (기록 on/off, 전략 3개 fan-out)
+- fetch_market_data[N]  : 지수 N개 수집 지연 및 처리량 (N = --tickers)
+- parse / serialize     : 응답 파싱, 시장 데이터 직렬화, 실행 기록 아카이브 쓰기/읽기
+
+결과는 p50/p95/p99(ms)로 출력되며 benchmarks/baseline.json과 비교해
+--tolerance 이상 느려진 항목이 있으면 exit code 1로 종료한다.
+회귀로 보이는 항목은 --confirm회까지 재측정해 가장 빠른 결과로 판정한다 (일시적 부하로 인한 오탐 방지).
+baseline은 절대 시간이므로 측정 조건(config)과 실행 환경이 같을 때만 비교한다.
+실행 환경은 Python minor 버전, OS 종류, CPU 아키텍처, 코어 수로만 판정한다 (커널/배포판 빌드는 무시).
+
+Usage (프로젝트 루트에서 실행):
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --latency-ms 50 --iterations 30
+    python benchmarks/run_benchmarks.py --update-baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add project root to sys.path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fake_servers import (
+    FakeGeminiServer,
+    FakeKisServer,
+    FakeTelegramServer,
+    KIS_INDEX_RESPONSE,
+    QUANT_TEXT,
+)
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_TICKERS = [2, 8, 32, 64]
+MICRO_BATCH = 2000  # 마이크로 벤치마크는 샘플 1개당 이만큼 반복한 평균을 사용 (타이머 노이즈 억제)
+
+
+# ============================================================
+# 통계
+# ============================================================
+def percentile(samples: list[float], pct: float) -> float:
+    """선형 보간 백분위수."""
+    ordered = sorted(samples)
+    k = (len(ordered) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize(samples_ms: list[float]) -> dict:
+    return {
+        "p50": round(percentile(samples_ms, 50), 4),
+        "p95": round(percentile(samples_ms, 95), 4),
+        "p99": round(percentile(samples_ms, 99), 4),
+        "n": len(samples_ms),
+    }
+
+
+def measure(fn, iterations: int, warmup: int = 1) -> list[float]:
+    """fn() 1회 실행 시간(ms)을 iterations번 측정. 봇의 print/로그 출력은 버린다."""
+    samples = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            fn()
+        for _ in range(iterations):
+            started = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def measure_batched(fn, iterations: int, batch: int) -> list[float]:
+    """짧은 연산용. batch회 반복의 평균(ms)을 1개 샘플로 삼는다."""
+    return [sample / batch for sample in measure(lambda: [fn() for _ in range(batch)], iterations)]
+
+
+# ============================================================
+# 환경 구성
+# ============================================================
+def seed_macro_cache(path: Path) -> None:
+    """매크로 캐시를 미리 채워 벤치마크 중 FinanceDataReader 네트워크 호출이 없도록 함."""
+    from src.data.macro_collector import MACRO_SYMBOLS
+
+    # fetched_at을 미래로 두어 TTL이 만료되지 않게 함
+    fetched_at = (datetime.now(timezone.utc) + timedelta(days=1)).isoformat()
+    cache = {
+        key: {"rows": [["2026-02-12", 100.0], ["2026-02-13", 101.0]], "fetched_at": fetched_at}
+        for key in MACRO_SYMBOLS
+    }
+    path.write_text(json.dumps(cache), encoding="utf-8")
+
+
+@contextlib.contextmanager
+def bench_environment(latency_ms: float):
+    """가짜 서버 3개를 띄우고 main_bot의 외부 엔드포인트/파일 경로를 임시 디렉터리로 돌린다."""
+    tmp = Path(tempfile.mkdtemp(prefix="jpm-bench-"))
+    kis = FakeKisServer(latency_ms).start()
+    gemini = FakeGeminiServer(latency_ms).start()
+    telegram = FakeTelegramServer(latency_ms).start()
+    bench_log, removed_handlers = None, []
+    try:
+        os.environ["KIS_BASE_URL"] = kis.url
+
+        from google import genai
+        from google.genai import types
+        from src import main_bot
+        from src.data import kis_collector, macro_collector
+
+        macro_collector.DEFAULT_CACHE_PATH = tmp / "macro_cache.json"
+        seed_macro_cache(macro_collector.DEFAULT_CACHE_PATH)
+
+        main_bot.gemini_client = genai.Client(
+            api_key="bench", http_options=types.HttpOptions(base_url=gemini.url)
+        )
+        main_bot.TELEGRAM_API_URL = telegram.url
+        main_bot.TELEGRAM_TOKEN = "bench"
+        kis_collector.REQUEST_INTERVAL = 0  # 호출 제한용 대기는 측정 대상이 아님
+        main_bot.ORDERS_FILE = tmp / "last_hour_orders.json"
+        main_bot.ORDERS_DIR = tmp / "orders"
+        main_bot.LEDGERS_DIR = tmp / "ledgers"
+        main_bot.STRATEGIES_FILE = tmp / "strategies.json"  # 없음 → default 전략 1개
+        main_bot.REPORTS_DIR = tmp / "reports"
+        main_bot.RUNS_DIR = tmp / "runs"
+        main_bot.GLOBAL_STATE_FILE = tmp / "global_state.md"
+        shutil.copy(Path(__file__).resolve().parent.parent / "context" / "global_state.md", main_bot.GLOBAL_STATE_FILE)
+
+        # 콘솔 로그는 WARNING 이상만, 파일 로그는 실제 logs/ 대신 임시 디렉터리로
+        for handler in list(main_bot.log.handlers):
+            if isinstance(handler, logging.FileHandler):
+                main_bot.log.removeHandler(handler)
+                handler.close()
+                removed_handlers.append(handler)
+            elif isinstance(handler, logging.StreamHandler):
+                handler.setLevel(logging.WARNING)
+        bench_log = logging.FileHandler(tmp / "bench.log", encoding="utf-8")
+        bench_log.setLevel(logging.DEBUG)
+        main_bot.log.addHandler(bench_log)
+
+        yield main_bot, tmp
+    finally:
+        if bench_log:
+            main_bot.log.removeHandler(bench_log)
+            bench_log.close()
+        for handler in removed_handlers:
+            main_bot.log.addHandler(handler)  # FileHandler는 다음 emit 시 파일을 다시 연다
+        for server in (kis, gemini, telegram):
+            server.stop()
+        os.environ.pop("KIS_BASE_URL", None)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+# ============================================================
+# 벤치마크
+# ============================================================
+def bench_pipeline(main_bot, iterations: int) -> dict:
+    from src.strategies import StrategyProfile
+
+    now = datetime(2026, 2, 13, 10, 0, tzinfo=main_bot.KST)
+    fanout = [StrategyProfile("default"), StrategyProfile("scalping"), StrategyProfile("swing")]
+    results = {}
+    for name, record, strategies in [
+        ("run_pipeline", False, None),
+        ("run_pipeline[record]", True, None),
+        ("run_pipeline[fanout x3]", False, fanout),
+    ]:
+        main_bot.record_runs = record
+
+        def run():
+            if not main_bot.run_pipeline(now, main_bot.MODE_LIVE, strategies=strategies):
+                raise RuntimeError("run_pipeline 실패 — 로그를 확인하세요.")
+
+        results[name] = measure(run, iterations)
+    main_bot.record_runs = True
+    return results
+
+
+def bench_fetch(main_bot, iterations: int, ticker_counts: list[int]) -> tuple[dict, dict]:
+    results, throughput = {}, {}
+    for n in ticker_counts:
+        indices = [(f"IDX{i}", f"{i:04d}") for i in range(n)]
+        name = f"fetch_market_data[{n}]"
+        results[name] = measure(lambda: main_bot.fetch_market_data(indices=indices), iterations)
+        throughput[name] = round(n / (percentile(results[name], 50) / 1000), 1)
+    return results, throughput
+
+
+def bench_parse_serialize(main_bot, iterations: int, tmp: Path) -> dict:
+    from src.recorder import RecordingRecorder, ReplayRecorder
+
+    kis_raw = json.dumps(KIS_INDEX_RESPONSE, ensure_ascii=False)
+    market_data = {
+        "indices": {f"IDX{i}": {"price": "5507.01", "change": "0.77"} for i in range(64)},
+        "investors": {"KOSPI": json.loads(json.dumps(KIS_INDEX_RESPONSE["output2"]))},
+        "exchange_rate": 1350.0,
+        "timestamp": "2026-02-13 10:00:00",
+    }
+
+    # 1회 파이프라인 분량의 기록 (KIS 3 + Gemini 3 + Telegram 1)
+    archive = tmp / "bench_archive.jsonl.gz"
+    prompt = json.dumps(market_data, ensure_ascii=False, indent=2) * 3
+
+    def write_archive():
+        recorder = RecordingRecorder(archive, {"run_at": "2026-02-13T10:00:00+09:00", "mode": "live"})
+        for _ in range(3):
+            recorder.call("kis", {"path": "/bench"}, lambda: KIS_INDEX_RESPONSE)
+        for _ in range(3):
+            recorder.call("gemini", {"prompt": prompt}, lambda: QUANT_TEXT)
+        recorder.call("telegram", {"text": QUANT_TEXT}, lambda: {"ok": True})
+        recorder.close()
+
+    write_archive()
+    return {
+        "parse_json_from_response": measure_batched(
+            lambda: main_bot.parse_json_from_response(QUANT_TEXT), iterations, MICRO_BATCH
+        ),
+        "kis_response_json_loads": measure_batched(lambda: json.loads(kis_raw), iterations, MICRO_BATCH),
+        "market_data_json_dumps": measure_batched(
+            lambda: json.dumps(market_data, ensure_ascii=False, indent=2), iterations, MICRO_BATCH // 10
+        ),
+        "recorder_archive_write": measure(write_archive, iterations),
+        "recorder_archive_load": measure(lambda: ReplayRecorder.load(archive), iterations),
+    }
+
+
+# ============================================================
+# 베이스라인 비교
+# ============================================================
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    baseline 대비 느려진 항목 목록 (모두 상대 비교).
+    p50은 tolerance를 그대로 적용하고, 꼬리 지연인 p95는 baseline 자체의 산포(p95/p50 - 1)를
+    노이즈 허용치로 더해 판정한다.
+    """
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base or not base["p50"]:
+            continue
+        spread = base["p95"] / base["p50"] - 1
+        for key, allowed in (("p50", tolerance), ("p95", tolerance + spread)):
+            if stats[key] > base[key] * (1 + allowed):
+                change = (stats[key] / base[key] - 1) * 100
+                regressions.append(f"{name} {key}: {base[key]:.4f} → {stats[key]:.4f} ms ({change:+.1f}%)")
+    return regressions
+
+
+def bench_env_info() -> dict:
+    """실행 환경 정보. platform은 참고용이며 비교에는 env_key()만 사용."""
+    return {
+        "python": platform.python_version(),
+        "system": platform.system(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def env_key(environment: dict) -> tuple:
+    """baseline 비교 가능 여부를 판정하는 환경 키 (Python minor, OS 종류, 아키텍처, 코어 수)."""
+    python_minor = ".".join(str(environment.get("python", "")).split(".")[:2])
+    return python_minor, environment.get("system"), environment.get("machine"), environment.get("cpu_count")
+
+
+def print_table(results: dict, baseline: dict, throughput: dict) -> None:
+    base_results = baseline.get("results", {})
+    print(f"\n{'metric':<30}{'p50':>11}{'p95':>11}{'p99':>11}{'base p50':>11}{'Δp50':>9}  throughput")
+    print("-" * 100)
+    for name, stats in results.items():
+        base = base_results.get(name)
+        base_p50 = f"{base['p50']:.3f}" if base else "-"
+        delta = f"{(stats['p50'] / base['p50'] - 1) * 100:+.1f}%" if base and base["p50"] else "-"
+        rate = f"{throughput[name]} tickers/s" if name in throughput else ""
+        print(f"{name:<30}{stats['p50']:>11.3f}{stats['p95']:>11.3f}{stats['p99']:>11.3f}{base_p50:>11}{delta:>9}  {rate}")
+    print("(단위: ms)")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="JPMorgan bot benchmark suite")
+    parser.add_argument("--latency-ms", type=float, default=20, help="가짜 서버 응답 지연 (기본 20ms)")
+    parser.add_argument("--iterations", type=int, default=20, help="항목별 측정 횟수 (기본 20)")
+    parser.add_argument("--tickers", type=int, nargs="+", default=DEFAULT_TICKERS, help="fetch_market_data 지수 개수")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="회귀 판정 허용 비율 (기본 0.25 = 25%%)")
+    parser.add_argument("--confirm", type=int, default=2, help="회귀 의심 항목 재측정 횟수 (기본 2, 0이면 재측정 안 함)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true", help="이번 결과를 baseline으로 저장")
+    parser.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    config = {"latency_ms": args.latency_ms, "iterations": args.iterations, "tickers": args.tickers}
+    environment = bench_env_info()
+    print("=" * 50)
+    print(f"🏁 Benchmark — latency {args.latency_ms}ms, {args.iterations} iterations")
+    print("=" * 50)
+
+    baseline = {}
+    if args.baseline.exists() and not args.update_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("config") != config:
+            print(f"\n⚠️  baseline 측정 조건이 다릅니다 ({baseline.get('config')}). 비교를 생략합니다.")
+            baseline = {}
+        elif env_key(baseline.get("environment") or {}) != env_key(environment):
+            print(
+                f"\n⚠️  baseline 실행 환경이 다릅니다 ({baseline.get('environment')}). "
+                "절대 시간 비교가 무의미하므로 생략합니다. 이 머신에서 --update-baseline으로 다시 생성하세요."
+            )
+            baseline = {}
+
+    suites = {
+        "run_pipeline": lambda main_bot, tmp: (bench_pipeline(main_bot, args.iterations), {}),
+        "fetch_market_data": lambda main_bot, tmp: bench_fetch(main_bot, args.iterations, args.tickers),
+        "parse / serialize": lambda main_bot, tmp: (bench_parse_serialize(main_bot, args.iterations, tmp), {}),
+    }
+    with bench_environment(args.latency_ms) as (main_bot, tmp):
+        results, throughput, suite_of = {}, {}, {}
+        print()
+        for suite, run in suites.items():
+            print(f"⏱  {suite} ...")
+            samples, rates = run(main_bot, tmp)
+            results.update({name: summarize(values) for name, values in samples.items()})
+            throughput.update(rates)
+            suite_of.update(dict.fromkeys(samples, suite))
+
+        # 공유 머신의 일시적 부하로 인한 오탐을 줄이기 위해, 회귀 의심 항목이 속한 묶음만 재측정해
+        # 항목별로 가장 빠른(p50) 결과를 사용한다 (best of N)
+        for attempt in range(1, args.confirm + 1):
+            suspects = {name for name in results if compare({name: results[name]}, baseline, args.tolerance)}
+            if not suspects:
+                break
+            print(f"🔁 회귀 의심 {len(suspects)}건 재측정 ({attempt}/{args.confirm}) — {', '.join(sorted(suspects))}")
+            for suite in dict.fromkeys(suite_of[name] for name in suspects):
+                samples, rates = suites[suite](main_bot, tmp)
+                for name in suspects & samples.keys():
+                    retry = summarize(samples[name])
+                    if retry["p50"] < results[name]["p50"]:
+                        results[name] = retry
+                        if name in rates:
+                            throughput[name] = rates[name]
+
+    report = {
+        "config": config,
+        "environment": environment,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "results": results,
+        "throughput": throughput,
+    }
+
+    print_table(results, baseline, throughput)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"\n💾 baseline 저장 → {args.baseline}")
+        return 0
+
+    if not baseline:
+        print("\nℹ️  비교할 baseline이 없습니다. --update-baseline으로 생성하세요.")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ 성능 회귀 {len(regressions)}건 (허용 {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"   - {line}")
+        return 1
+
+    print(f"\n✅ baseline 대비 회귀 없음 (허용 {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
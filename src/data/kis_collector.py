@@ -1,9 +1,15 @@
 import os
 import time
+import threading
 import requests
 import json
 from datetime import datetime
 
+from src.data.macro_collector import MacroCollector, MacroValue
+from src.recorder import current_recorder
+
+REQUEST_INTERVAL = 0.2  # KIS rate limit: minimum spacing (seconds) between requests of one KisData
+
 class KisAuth:
     """
     Korea Investment & Securities (KIS) API Authentication Manager.
@@ -16,7 +22,9 @@ class KisAuth:
         
         # Select Base URL based on Mode
         self.mode = os.getenv("KIS_MODE", "SIMULATION").upper()
-        if self.mode == "REAL":
+        if os.getenv("KIS_BASE_URL"):
+            self.base_url = os.getenv("KIS_BASE_URL") # e.g. local stand-in server for benchmarks
+        elif self.mode == "REAL":
             self.base_url = "https://openapi.koreainvestment.com:9443"
         else:
             self.base_url = "https://openapivts.koreainvestment.com:29443" # Simulation
@@ -74,15 +82,45 @@ class KisData:
     """
     KIS Data Collector.
     Fetches market data using KisAuth.
+    Requests are throttled per instance, so threads sharing one KisData
+    stay within the rate limit together.
     """
-    def __init__(self, auth_manager: KisAuth):
+    def __init__(self, auth_manager: KisAuth, macro: MacroCollector = None):
         self.auth = auth_manager
         self.base_url = self.auth.base_url
+        self.macro = macro or MacroCollector()
+        self._throttle_lock = threading.Lock()
+        self._last_request = 0.0
+
+    def _throttle(self):
+        """Wait until REQUEST_INTERVAL has passed since the previous request of this instance."""
+        with self._throttle_lock:
+            wait = self._last_request + REQUEST_INTERVAL - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_request = time.monotonic()
 
-    def get_market_index(self, market_code="0001"):
+    def _get(self, path, tr_id, params):
+        """
+        GET a KIS quotation endpoint through the active run recorder.
+        Headers (token, app secret) are built inside the call so replay never
+        authenticates and secrets never reach the archive.
+        Replayed calls skip the throttle as well.
+        """
+        def fetch():
+            self._throttle()
+            res = requests.get(f"{self.base_url}{path}", headers=self.auth.get_header(tr_id), params=params)
+            res.raise_for_status()
+            return res.json()
+
+        return current_recorder().call("kis", {"path": path, "tr_id": tr_id, "params": params}, fetch)
+
+    def get_market_index(self, market_code="0001", start=None, end=None):
         """
         Fetch Current Index (KOSPI/KOSDAQ).
         market_code: '0001' (KOSPI), '1001' (KOSDAQ)
+        start, end: optional YYYYMMDD range for the daily candles in output2
+                    (at most 50 candles per request).
         """
         # Endpoint for Index Current Price (not stock)
         # Using 'FHKUP03500100' (Upcode - Index) or similar.
@@ -90,20 +128,19 @@ class KisData:
         # OR we use the specific Index Snapshot TR ID: FHKST01010400
         
         tr_id = "FHKST01010400" 
-        url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-daily-index-chartprice"
-        
-        headers = self.auth.get_header(tr_id)
+        path = "/uapi/domestic-stock/v1/quotations/inquire-daily-index-chartprice"
         params = {
             "FID_COND_MRKT_DIV_CODE": "J",
             "FID_INPUT_ISCD": market_code,
             "FID_PERIOD_DIV_CODE": "D",
             "FID_ORG_ADJ_PRC": "0"
         }
+        if start and end:
+            params["FID_INPUT_DATE_1"] = start
+            params["FID_INPUT_DATE_2"] = end
         
         try:
-            res = requests.get(url, headers=headers, params=params)
-            res.raise_for_status()
-            return res.json()
+            return self._get(path, tr_id, params)
         except Exception as e:
             print(f"[KisData] Error fetching index {market_code}: {e}")
             return None
@@ -114,18 +151,14 @@ class KisData:
         TR ID: FHKST01010900 (Investor Trend)
         """
         tr_id = "FHKST01010900"
-        url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-investor"
-        
-        headers = self.auth.get_header(tr_id)
+        path = "/uapi/domestic-stock/v1/quotations/inquire-investor"
         params = {
             "FID_COND_MRKT_DIV_CODE": "J",
             "FID_INPUT_ISCD": market_code,
         }
         
         try:
-            res = requests.get(url, headers=headers, params=params)
-            res.raise_for_status()
-            return res.json()
+            return self._get(path, tr_id, params)
         except Exception as e:
             print(f"[KisData] Error fetching investor trend {market_code}: {e}")
             return None
@@ -133,16 +166,30 @@ class KisData:
     def get_exchange_rate(self):
         """
         Fetch USD/KRW Exchange Rate.
-        Fallback to FinanceDataReader if KIS Overseas API is not configured.
+        Served from the MacroCollector cache (delta fetch only when the TTL expired).
+        Returns None when no value has ever been fetched.
         """
-        try:
-            # Fallback: using FinanceDataReader (if installed) or a simple public API for MVP
-            import FinanceDataReader as fdr
-            df = fdr.DataReader('USD/KRW', data_source='woori') # Real-time-ish
-            return df.iloc[-1]['Close']
-        except ImportError:
-            print("[KisData] FinanceDataReader not installed. Returning mock data.")
-            return 1350.0
-        except Exception as e:
-            print(f"[KisData] Error fetching exchange rate: {e}")
-            return None
+        rate = MacroValue(**current_recorder().call(
+            "macro", {"keys": ["USD/KRW"]}, lambda: self.macro.get("USD/KRW").to_dict()
+        ))
+        if rate.stale:
+            print(f"[KisData] USD/KRW is stale (as of {rate.as_of})")
+        return rate.value
+
+    def get_macro_snapshot(self):
+        """Fetch all macro series (USD/KRW, DXY, US futures, SOX) as {key: MacroValue}."""
+        snapshot = current_recorder().call(
+            "macro",
+            {"keys": list(self.macro.symbols)},
+            lambda: {key: value.to_dict() for key, value in self.macro.get_all().items()},
+        )
+        return {key: MacroValue(**value) for key, value in snapshot.items()}
+
+    def get_macro_history(self, start, end):
+        """
+        Daily macro closes between start and end (YYYY-MM-DD) for backfill.
+        Returns {key: {"symbol": ..., "rows": [[date, close], ...]}}, see MacroCollector.get_history.
+        """
+        return current_recorder().call(
+            "macro", {"history": [start, end]}, lambda: self.macro.get_history(start, end)
+        )
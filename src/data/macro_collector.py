@@ -0,0 +1,200 @@
+import json
+import threading
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from src.fileio import atomic_write
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent.parent / "cache" / "macro_cache.json"
+
+# key: (FinanceDataReader symbol, freshness TTL in seconds)
+MACRO_SYMBOLS = {
+    "USD/KRW": ("USD/KRW", 10 * 60),
+    "DXY": ("DX-Y.NYB", 30 * 60),
+    "NASDAQ100_FUT": ("NQ=F", 10 * 60),
+    "SP500_FUT": ("ES=F", 10 * 60),
+    "SOX": ("^SOX", 6 * 60 * 60),  # US cash index, only moves once a day for KR hours
+}
+
+INITIAL_LOOKBACK_DAYS = 30  # first fetch only, later fetches start at the last cached date
+MAX_CACHED_ROWS = 60
+FETCH_TIMEOUT_SECONDS = 15  # fdr.DataReader has no timeout of its own
+
+
+@dataclass(frozen=True)
+class MacroValue:
+    """
+    Latest close of a macro series.
+    stale=True means the value could not be refreshed within its TTL
+    and is served from an older cache entry (or is missing entirely).
+    """
+    key: str
+    symbol: str
+    value: float | None
+    change_pct: float | None
+    as_of: str | None       # date of the latest close (YYYY-MM-DD)
+    fetched_at: str | None  # last successful fetch (UTC ISO)
+    stale: bool
+
+    def to_dict(self):
+        return asdict(self)
+
+
+class MacroCollector:
+    """
+    FX / Macro Data Collector (USD/KRW, DXY, US futures, SOX).
+    Keeps a small local cache and only fetches the delta since the last cached date.
+    A failed fetch is recorded in the cache and not retried until the TTL expires again,
+    so an unreachable source costs at most one timeout per TTL instead of one per call.
+    """
+    _lock = threading.Lock()  # cache file is shared by all instances (backfill workers)
+
+    def __init__(self, cache_path: Path = None, symbols: dict = None):
+        self.cache_path = Path(cache_path or DEFAULT_CACHE_PATH)
+        self.symbols = symbols or MACRO_SYMBOLS
+
+    def get(self, key: str) -> MacroValue:
+        """Return the latest value for a single key, refreshing it if the TTL expired."""
+        with self._lock:
+            cache = self._load_cache()
+            value, dirty = self._refresh(cache, key)
+            if dirty:
+                self._save_cache(cache)
+        return value
+
+    def get_all(self) -> dict:
+        """Return {key: MacroValue} for every configured symbol with a single cache load/save."""
+        result = {}
+        with self._lock:
+            cache = self._load_cache()
+            dirty = False
+            for key in self.symbols:
+                result[key], changed = self._refresh(cache, key)
+                dirty = dirty or changed
+            if dirty:
+                self._save_cache(cache)
+        return result
+
+    def get_history(self, start: str, end: str) -> dict:
+        """
+        Return {key: {"symbol": symbol, "rows": [(YYYY-MM-DD, close), ...]}} between start and end
+        (inclusive) for backfill. Bypasses the cache, which only holds the most recent closes.
+        A series that fails to load has empty rows.
+        """
+        history = {}
+        for key, (symbol, _ttl) in self.symbols.items():
+            try:
+                rows = self._fetch_delta(symbol, start, end)
+            except Exception as e:
+                print(f"[MacroCollector] Error fetching history {key} ({symbol}): {e}")
+                rows = []
+            history[key] = {"symbol": symbol, "rows": rows}
+        return history
+
+    @staticmethod
+    def values_as_of(history: dict, day: str) -> dict:
+        """{key: MacroValue} as of `day` (YYYY-MM-DD), built from get_history() rows up to that day."""
+        return {
+            key: MacroCollector._to_value(
+                key,
+                item["symbol"],
+                {"rows": [row for row in item["rows"] if row[0] <= day], "fetched_at": None},
+                stale=False,
+            )
+            for key, item in history.items()
+        }
+
+    def _refresh(self, cache: dict, key: str):
+        """Refresh cache[key] in place if expired. Returns (MacroValue, cache_changed)."""
+        symbol, ttl = self.symbols[key]
+        entry = cache.get(key) or {"rows": [], "fetched_at": None}
+        now = datetime.now(timezone.utc)
+
+        if entry["fetched_at"]:
+            age = now - datetime.fromisoformat(entry["fetched_at"])
+            if age < timedelta(seconds=ttl):
+                return self._to_value(key, symbol, entry, stale=False), False
+
+        # Back off after a failure: serve the stale value until the TTL has passed since the failure
+        if entry.get("failed_at"):
+            since_failure = now - datetime.fromisoformat(entry["failed_at"])
+            if since_failure < timedelta(seconds=ttl):
+                return self._to_value(key, symbol, entry, stale=True), False
+
+        rows = entry["rows"]
+        since = rows[-1][0] if rows else (now - timedelta(days=INITIAL_LOOKBACK_DAYS)).strftime("%Y-%m-%d")
+        try:
+            delta = self._fetch_delta(symbol, since)
+        except Exception as e:
+            if isinstance(e, ImportError):
+                print("[MacroCollector] FinanceDataReader not installed. Serving cached data.")
+            else:
+                print(f"[MacroCollector] Error fetching {key} ({symbol}): {e}")
+            entry = {**entry, "failed_at": now.isoformat()}
+            cache[key] = entry
+            return self._to_value(key, symbol, entry, stale=True), True
+
+        # The last cached day is re-fetched because its close may still be moving intraday
+        merged = dict(rows)
+        merged.update(delta)
+        entry = {
+            "rows": sorted(merged.items())[-MAX_CACHED_ROWS:],
+            "fetched_at": now.isoformat(),
+        }
+        cache[key] = entry
+        return self._to_value(key, symbol, entry, stale=False), True
+
+    def _fetch_delta(self, symbol: str, since: str, until: str = None) -> list:
+        """
+        Fetch [(YYYY-MM-DD, close), ...] from `since` to `until` (inclusive, default today).
+        Raises TimeoutError after FETCH_TIMEOUT_SECONDS; the abandoned request keeps running
+        in a daemon thread since fdr offers no way to cancel it.
+        """
+        import FinanceDataReader as fdr
+
+        result = {}
+
+        def read():
+            try:
+                result["df"] = fdr.DataReader(symbol, since, until)
+            except Exception as e:
+                result["error"] = e
+
+        worker = threading.Thread(target=read, name=f"macro-fetch-{symbol}", daemon=True)
+        worker.start()
+        worker.join(FETCH_TIMEOUT_SECONDS)
+        if worker.is_alive():
+            raise TimeoutError(f"no response within {FETCH_TIMEOUT_SECONDS}s")
+        if "error" in result:
+            raise result["error"]
+        return [
+            (idx.strftime("%Y-%m-%d"), float(close))
+            for idx, close in result["df"]["Close"].dropna().items()
+        ]
+
+    @staticmethod
+    def _to_value(key: str, symbol: str, entry: dict, stale: bool) -> MacroValue:
+        rows = entry["rows"]
+        if not rows:
+            return MacroValue(key, symbol, None, None, None, entry["fetched_at"], stale=True)
+
+        as_of, value = rows[-1]
+        change_pct = None
+        if len(rows) >= 2 and rows[-2][1]:
+            change_pct = round((value / rows[-2][1] - 1) * 100, 2)
+        return MacroValue(key, symbol, value, change_pct, as_of, entry["fetched_at"], stale)
+
+    def _load_cache(self) -> dict:
+        if not self.cache_path.exists():
+            return {}
+        try:
+            return json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[MacroCollector] Ignoring unreadable cache {self.cache_path}: {e}")
+            return {}
+
+    def _save_cache(self, cache: dict):
+        """Write the cache atomically so a crash never leaves a partial file."""
+        with atomic_write(self.cache_path) as f:
+            json.dump(cache, f, ensure_ascii=False)
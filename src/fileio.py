@@ -0,0 +1,42 @@
+"""
+File I/O 유틸리티 — 원자적 파일 쓰기.
+
+같은 디렉터리의 임시 파일에 쓰고 fsync한 뒤 os.replace로 교체한다.
+중간에 죽어도 기존 파일이 그대로 남거나 새 파일로 완전히 바뀌며, 반쪽 파일은 남지 않는다.
+
+    atomic_write_text(path, text)
+
+    with atomic_write(path, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+        f.write(...)
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+
+@contextmanager
+def atomic_write(path: Path, mode: str = "w", encoding: str | None = "utf-8"):
+    """임시 파일 객체를 yield하고, with 블록이 정상 종료되면 path로 교체. 예외 시 임시 파일 삭제."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """텍스트 파일을 원자적으로 교체."""
+    with atomic_write(path) as f:
+        f.write(text)
@@ -2,19 +2,43 @@
 JPMorgan AI Trading Bot - main_bot.py
 1시간마다 한국 주식시장을 분석하고 텔레그램으로 알림을 보내는 자율 매매 봇.
 Pipeline: Market Analyst → Quant Strategist → Risk Officer → Telegram
+
+Usage (프로젝트 루트에서 실행):
+    python -m src.main_bot daemon                 # 매 정각 스케줄 실행 (기본값)
+    python -m src.main_bot run-once               # 1회 실행
+    python -m src.main_bot dry-run                # 1회 실행, 텔레그램/주문/상태 파일 미변경
+    python -m src.main_bot backfill --from "2026-02-13 09:00" --to "2026-02-13 15:00"
+    python -m src.main_bot replay runs/<archive>.jsonl.gz  # 기록된 실행을 네트워크 없이 재생
+    python -m src.main_bot run-once --strategy scalping --strategy swing  # 일부 전략만 실행
+
+모든 실행의 외부 I/O(프롬프트/응답 전문 포함)는 runs/*.jsonl.gz에 기록된다 (--no-record로 비활성화).
+RUNS_RETENTION_DAYS(환경변수, 기본 14일)보다 오래된 아카이브는 새 실행을 기록할 때 자동 삭제된다 (0이면 보관).
+.agent/strategies.json에 전략이 여러 개면 데이터 수집/Analyst는 공유하고
+전략별 Quant → Risk 체인을 병렬 실행한다 (src/strategies.py 참고).
 """
 
+import argparse
+import contextvars
 import json
 import logging
 import os
 import re
+import signal
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime, timedelta, date
 from pathlib import Path
 try:
     from zoneinfo import ZoneInfo
 except ImportError:
     from backports.zoneinfo import ZoneInfo
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 from google import genai
 from google.genai import types
@@ -23,31 +47,72 @@ import schedule
 from dotenv import load_dotenv
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+from src.fileio import atomic_write_text
+from src.recorder import Recorder, RecordingRecorder, ReplayRecorder, current_recorder, use_recorder
+from src.strategies import DEFAULT_STRATEGY, StrategyProfile, load_strategies, select_strategies
+
 # ============================================================
 # 🔑 API Keys — .env 파일에서 로드
 # ============================================================
 load_dotenv(Path(__file__).resolve().parent.parent / ".env")
 
-GEMINI_API_KEY = os.environ["GEMINI_API_KEY"]
-TELEGRAM_TOKEN = os.environ["TELEGRAM_TOKEN"]
-TELEGRAM_CHAT_ID = os.environ["TELEGRAM_CHAT_ID"]
+# replay는 네트워크를 쓰지 않으므로 키 없이도 동작해야 함 (필요 시 main()에서 검사)
+GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
+# dry-run / backfill은 텔레그램 없이도 동작해야 하므로 여기서는 선택값 (daemon/run-once는 main()에서 검사)
+TELEGRAM_TOKEN = os.environ.get("TELEGRAM_TOKEN", "")
+TELEGRAM_CHAT_ID = os.environ.get("TELEGRAM_CHAT_ID", "")
+TELEGRAM_API_URL = os.environ.get("TELEGRAM_API_URL", "https://api.telegram.org")
 
 # ============================================================
 # 📁 경로 설정
 # ============================================================
 BASE_DIR = Path(__file__).resolve().parent.parent
 SKILLS_DIR = BASE_DIR / ".agent" / "skills"
-ORDERS_FILE = BASE_DIR / "last_hour_orders.json"
+ORDERS_FILE = BASE_DIR / "last_hour_orders.json"  # default 전략의 주문 파일
+ORDERS_DIR = BASE_DIR / "orders"                    # 그 외 전략: orders/<name>.json
+LEDGERS_DIR = BASE_DIR / "ledgers"                  # 전략별 주문 원장: ledgers/<name>.jsonl
+STRATEGIES_FILE = BASE_DIR / ".agent" / "strategies.json"
 REPORTS_DIR = BASE_DIR / "reports"
 LOGS_DIR = BASE_DIR / "logs"
 GLOBAL_STATE_FILE = BASE_DIR / "context" / "global_state.md"
+LOCK_FILE = BASE_DIR / ".pipeline.lock"
+BACKFILL_LOCK_FILE = BASE_DIR / ".backfill.lock"  # backfill끼리만 배타 (live 실행과는 무관)
+RUNS_DIR = BASE_DIR / "runs"
+
+# runs/ 아카이브 보관 기간 (일, 파일 수정 시각 기준). 0이면 삭제하지 않음
+RUNS_RETENTION_DAYS = int(os.environ.get("RUNS_RETENTION_DAYS", "14"))
 
 KST = ZoneInfo("Asia/Seoul")
 GEMINI_MODEL = "gemini-2.5-flash"
 
+# 수집 대상 지수 (이름, KIS 업종 코드)
+MARKET_INDICES = [("KOSPI", "0001"), ("KOSDAQ", "1001")]
+# KIS 호출 간격 제한은 KisData가 인스턴스 단위로 적용 (kis_collector.REQUEST_INTERVAL)
+
+# backfill 일봉 조회: inquire-daily-index-chartprice는 1회 최대 50봉이므로 45일(영업일 ~32일)씩 나눠 조회
+BACKFILL_WINDOW_DAYS = 45
+BACKFILL_LOOKBACK_DAYS = 10  # 첫 날의 전일 대비 등락률 계산용 여유 기간
+
+# 실행 모드
+MODE_LIVE = "live"          # 텔레그램 전송 + 주문/상태/리포트 저장
+MODE_DRY_RUN = "dry-run"    # 아무것도 전송/저장하지 않고 로그만 남김
+MODE_BACKFILL = "backfill"  # 과거 거래일의 일봉 데이터로 리포트만 reports/backfill/에 저장
+
 # Gemini Client (main()에서 초기화)
 gemini_client: genai.Client = None
 
+# 실행별 외부 I/O 기록 여부 (--no-record로 끔)
+record_runs = True
+
+# 실행할 전략 이름 (--strategy로 지정, 비어 있으면 strategies.json 전체)
+strategy_names: list[str] = []
+
+# 전략 체인이 병렬로 global_state.md를 갱신할 때의 read-modify-write 보호
+_state_lock = threading.Lock()
+
+# daemon 모드 종료 신호 (SIGINT/SIGTERM)
+shutdown_event = threading.Event()
+
 # ============================================================
 # 📋 한국 공휴일 (2026년)
 # ============================================================
@@ -120,19 +185,72 @@ def load_skill_prompt(agent_name: str) -> str:
     return raw.strip()
 
 
-def load_previous_orders() -> str:
-    """last_hour_orders.json을 읽어 문자열로 반환. 없으면 빈 리스트."""
-    if ORDERS_FILE.exists():
-        return ORDERS_FILE.read_text(encoding="utf-8")
+@contextmanager
+def pipeline_lock(lock_path: Path = LOCK_FILE):
+    """
+    파이프라인 중복 실행 방지용 파일 락. 획득 여부(bool)를 yield.
+    OS advisory lock(fcntl.flock, Windows는 msvcrt.locking)이라 프로세스가 비정상 종료되면
+    OS가 락을 풀어 주므로 오래된 락을 추측해 지울 필요가 없다.
+    락 파일 자체는 지우지 않는다 (지우면 다른 프로세스가 새 파일에 따로 락을 잡을 수 있음).
+    파일 내용(PID, 시각)은 확인용일 뿐 락 판정에는 쓰지 않는다.
+    """
+    fd = os.open(lock_path, os.O_CREAT | os.O_RDWR)
+    try:
+        try:
+            _lock_fd(fd)
+        except OSError:
+            yield False
+            return
+
+        try:
+            os.ftruncate(fd, 0)
+            os.write(fd, f"{os.getpid()} {datetime.now(KST).isoformat()}\n".encode("utf-8"))
+            yield True
+        finally:
+            _unlock_fd(fd)
+    finally:
+        os.close(fd)
+
+
+def _lock_fd(fd: int) -> None:
+    """fd에 배타 락을 즉시 시도. 다른 곳에서 잡고 있으면 OSError."""
+    if fcntl:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+
+def _unlock_fd(fd: int) -> None:
+    if fcntl:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def orders_path(profile: StrategyProfile) -> Path:
+    """전략별 주문 파일 경로. default 전략은 기존 last_hour_orders.json을 그대로 사용."""
+    if profile.is_default:
+        return ORDERS_FILE
+    return ORDERS_DIR / f"{profile.name}.json"
+
+
+def load_previous_orders(path: Path | None = None) -> str:
+    """주문 파일(기본 last_hour_orders.json)을 읽어 문자열로 반환. 없으면 빈 리스트."""
+    path = path or ORDERS_FILE
+    if path.exists():
+        return path.read_text(encoding="utf-8")
     return "[]"
 
 
-def save_orders(orders_json: str) -> None:
-    """새 주문 JSON을 last_hour_orders.json에 덮어쓰기."""
+def save_orders(orders_json: str, path: Path | None = None) -> None:
+    """새 주문 JSON을 주문 파일(기본 last_hour_orders.json)에 덮어쓰기."""
+    path = path or ORDERS_FILE
     try:
         json.loads(orders_json)
-        ORDERS_FILE.write_text(orders_json, encoding="utf-8")
-        log.info("주문 내역 저장 완료 → %s", ORDERS_FILE)
+        atomic_write_text(path, orders_json)
+        log.info("주문 내역 저장 완료 → %s", path)
     except json.JSONDecodeError:
         log.warning("유효하지 않은 JSON이라 저장하지 않습니다: %s...", orders_json[:50])
 
@@ -150,19 +268,27 @@ def parse_json_from_response(text: str) -> str:
 
 def send_telegram(message: str) -> None:
     """텔레그램 Bot API로 메시지 전송."""
-    url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
+    url = f"{TELEGRAM_API_URL}/bot{TELEGRAM_TOKEN}/sendMessage"
     payload = {
         "chat_id": TELEGRAM_CHAT_ID,
         "text": message,
     }
-    try:
-        resp = requests.post(url, json=payload, timeout=10)
-        if resp.ok:
-            log.info("텔레그램 전송 성공")
-        else:
-            log.error("텔레그램 전송 실패: %s %s", resp.status_code, resp.text)
-    except requests.RequestException as e:
-        log.error("텔레그램 연결 오류: %s", e)
+
+    def post() -> dict:
+        try:
+            resp = requests.post(url, json=payload, timeout=10)
+            return {"ok": resp.ok, "status": resp.status_code, "text": resp.text}
+        except requests.RequestException as e:
+            return {"ok": False, "error": str(e)}
+
+    # 토큰이 포함된 url은 기록하지 않음
+    result = current_recorder().call("telegram", {"text": message}, post)
+    if result["ok"]:
+        log.info("텔레그램 전송 성공")
+    elif "error" in result:
+        log.error("텔레그램 연결 오류: %s", result["error"])
+    else:
+        log.error("텔레그램 전송 실패: %s %s", result["status"], result["text"])
 
 
 # ============================================================
@@ -171,17 +297,27 @@ def send_telegram(message: str) -> None:
 # ============================================================
 # 📡 실시간 시장 데이터 수집 (KIS OpenAPI)
 # ============================================================
-def fetch_market_data() -> str:
-    """KIS OpenAPI를 통해 실시간/장중 지수, 환율, 수급 데이터를 수집하여 포맷팅된 JSON 문자열 반환."""
+def new_kis_collector():
+    """KisAuth + KisData 생성. 토큰은 첫 요청 시(get_token) 발급된다."""
     from src.data.kis_collector import KisAuth, KisData
+
+    return KisData(KisAuth())
+
+
+def fetch_market_data(
+    now: datetime | None = None,
+    indices: list[tuple[str, str]] = MARKET_INDICES,
+) -> str:
+    """
+    KIS OpenAPI를 통해 실시간/장중 지수, 환율, 수급 데이터를 수집하여 포맷팅된 JSON 문자열 반환.
+    now: timestamp 표기 시각 (replay 시 기록 당시 시각으로 프롬프트를 맞추기 위함). 기본값 현재 시각.
+    indices: 수집할 (이름, 코드) 목록. 기본값 MARKET_INDICES.
+    """
     import json
 
     # KIS 연결 초기화
     try:
-        auth = KisAuth()
-        # 토큰 발급 (실패 시 로그 남기고 빈 데이터 반환 가능성 있음)
-        # auth.auth() # get_token에서 자동 호출됨
-        collector = KisData(auth)
+        collector = new_kis_collector()
     except Exception as e:
         log.error("KIS API 초기화 실패: %s", e)
         return json.dumps({"error": str(e)}, ensure_ascii=False)
@@ -190,11 +326,12 @@ def fetch_market_data() -> str:
         "indices": {},
         "investors": {},
         "exchange_rate": None,
-        "timestamp": datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S")
+        "macro": {},
+        "timestamp": (now or datetime.now(KST)).strftime("%Y-%m-%d %H:%M:%S")
     }
 
     # ── 1) KOSPI / KOSDAQ 지수 ──
-    for name, code in [("KOSPI", "0001"), ("KOSDAQ", "1001")]:
+    for name, code in indices:
         try:
             res = collector.get_market_index(code)
             if res and res.get('rt_cd') == '0':
@@ -220,14 +357,17 @@ def fetch_market_data() -> str:
         except Exception as e:
             log.error(f"{name} 지수 수집 실패: {e}")
             data["indices"][name] = {"error": str(e)}
-            
-        time.sleep(0.2) # API 제한 고려
 
-    # ── 2) USD/KRW 환율 ──
+    # ── 2) 환율 / 매크로 (USD/KRW, DXY, 미국 선물, SOX — 로컬 캐시 기반) ──
     try:
-        data["exchange_rate"] = collector.get_exchange_rate()
+        macro = collector.get_macro_snapshot()
+        data["macro"] = {key: value.to_dict() for key, value in macro.items()}
+        data["exchange_rate"] = macro["USD/KRW"].value
+        stale = [key for key, value in macro.items() if value.stale]
+        if stale:
+            log.warning("매크로 데이터 갱신 실패 (캐시값 사용): %s", ", ".join(stale))
     except Exception as e:
-        log.error(f"환율 수집 실패: {e}")
+        log.error(f"매크로 데이터 수집 실패: {e}")
 
     # ── 3) 투자자별 매매동향 (KOSPI 기준) ──
     try:
@@ -249,12 +389,133 @@ def fetch_market_data() -> str:
     return json.dumps(data, ensure_ascii=False, indent=2)
 
 
+def fetch_daily_history(start: date, end: date, indices: list[tuple[str, str]] = MARKET_INDICES) -> dict:
+    """
+    backfill용 과거 데이터를 1회 수집 (KIS 일봉 지수, 일별 투자자 수급, 매크로 일별 종가).
+    워커들은 이 결과에서 날짜별 스냅샷(daily_market_snapshot)만 잘라 쓰므로 KIS 호출은 여기서만 발생한다.
+    KIS 토큰 발급에 실패하면 예외를 그대로 던진다.
+
+    반환: {"indices": {이름: {YYYYMMDD: 일봉}}, "investors": {"KOSPI": [일별 행, ...]},
+           "macro": MacroCollector.get_history() 형식}
+    """
+    collector = new_kis_collector()
+    collector.auth.get_token()
+
+    first = start - timedelta(days=BACKFILL_LOOKBACK_DAYS)
+    first_key, end_key = first.strftime("%Y%m%d"), end.strftime("%Y%m%d")
+    history = {"indices": {}, "investors": {}, "macro": {}}
+
+    # ── 1) 지수 일봉 (output2), 기간을 나눠 조회 ──
+    for name, code in indices:
+        candles = {}
+        window_start = first
+        while window_start <= end:
+            window_end = min(window_start + timedelta(days=BACKFILL_WINDOW_DAYS - 1), end)
+            res = collector.get_market_index(
+                code, start=window_start.strftime("%Y%m%d"), end=window_end.strftime("%Y%m%d")
+            )
+            if res and res.get("rt_cd") == "0":
+                for row in res.get("output2") or []:
+                    day = row.get("stck_bsop_date", "")
+                    if first_key <= day <= end_key:
+                        candles[day] = row
+            else:
+                log.error(
+                    "%s 일봉 수집 실패 (%s ~ %s): %s",
+                    name, window_start, window_end, res.get("msg1") if res else "Unknown error",
+                )
+            window_start = window_end + timedelta(days=1)
+        history["indices"][name] = candles
+
+    # ── 2) 투자자별 매매동향 (KOSPI, 최근 약 30영업일만 제공) ──
+    res = collector.get_investor_trend("0001")
+    if res and res.get("rt_cd") == "0":
+        history["investors"]["KOSPI"] = res.get("output", [])
+    else:
+        log.error("수급 데이터 수집 실패: %s", res.get("msg1") if res else "Failed")
+
+    # ── 3) 매크로 일별 종가 ──
+    history["macro"] = collector.get_macro_history(first.isoformat(), end.isoformat())
+
+    log.info("backfill 일봉 데이터 수집 완료 (%s ~ %s)", start, end)
+    return history
+
+
+def daily_market_snapshot(history: dict, now: datetime) -> str | None:
+    """
+    fetch_daily_history() 결과에서 now 날짜의 시장 데이터를 fetch_market_data()와 같은 형식으로 생성.
+    값은 모두 그 날의 일봉(종가) 기준이며, 해당 날짜의 지수 일봉이 하나도 없으면 None.
+    """
+    import json
+
+    from src.data.macro_collector import MacroCollector
+
+    day_key = now.strftime("%Y%m%d")
+    data = {
+        "indices": {},
+        "investors": {},
+        "exchange_rate": None,
+        "macro": {},
+        "timestamp": now.strftime("%Y-%m-%d %H:%M:%S"),
+        "granularity": "daily",  # 장중 값이 아닌 해당 일자 종가 기준
+    }
+
+    # ── 1) 지수: 해당 일자 일봉 + 전일 종가 대비 등락률 ──
+    for name, candles in history["indices"].items():
+        row = candles.get(day_key)
+        if not row:
+            data["indices"][name] = {"error": "해당 일자 일봉 없음"}
+            continue
+        earlier = [day for day in candles if day < day_key]
+        close = float(row["bstp_nmiv_prpr"])
+        change = None
+        if earlier:
+            prev_close = float(candles[max(earlier)]["bstp_nmiv_prpr"])
+            change = f"{(close / prev_close - 1) * 100:.2f}"
+        data["indices"][name] = {
+            "price": row["bstp_nmiv_prpr"],
+            "change": change,
+            "open": row.get("bstp_nmiv_oprc"),
+            "high": row.get("bstp_nmiv_hgpr"),
+            "low": row.get("bstp_nmiv_lwpr"),
+            "volume": row.get("acml_vol"),
+        }
+    if all("error" in value for value in data["indices"].values()):
+        return None
+
+    # ── 2) 환율 / 매크로: 해당 일자까지의 마지막 종가 ──
+    macro = MacroCollector.values_as_of(history["macro"], now.strftime("%Y-%m-%d"))
+    data["macro"] = {key: value.to_dict() for key, value in macro.items()}
+    if "USD/KRW" in macro:
+        data["exchange_rate"] = macro["USD/KRW"].value
+
+    # ── 3) 투자자별 매매동향: 해당 일자까지의 행만 ──
+    for name, rows in history["investors"].items():
+        rows = [row for row in rows if row.get("stck_bsop_date", "") <= day_key]
+        if rows:
+            data["investors"][name] = rows
+        else:
+            data["investors"][name] = {"error": "해당 일자 수급 없음 (KIS는 최근 약 30영업일만 제공)"}
+
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
 # ============================================================
 # 🤖 Gemini API 호출 (Retry 포함)
 # ============================================================
+_gemini_backoff = wait_exponential(multiplier=2, min=2, max=8)
+
+
+def gemini_retry_wait(retry_state) -> float:
+    """재시도 대기 시간. replay 중에는 기록된 실패를 재현할 뿐이므로 기다리지 않음."""
+    if current_recorder().replaying:
+        return 0
+    return _gemini_backoff(retry_state)
+
+
 @retry(
     stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=2, min=2, max=8),
+    wait=gemini_retry_wait,
     retry=retry_if_exception_type(Exception),
     before_sleep=lambda retry_state: log.warning(
         "Gemini API 재시도 %d/3 (%s)",
@@ -266,19 +527,24 @@ def call_gemini(system_prompt: str, user_prompt: str) -> str:
     """일반 Gemini API 호출 (Quant, Risk Officer용). 실패 시 최대 3회 재시도."""
     full_prompt = f"{system_prompt}\n\n---\n\n{user_prompt}"
 
-    response = gemini_client.models.generate_content(
-        model=GEMINI_MODEL,
-        contents=full_prompt,
-    )
-
-    if response.text:
+    def generate() -> str | None:
+        response = gemini_client.models.generate_content(
+            model=GEMINI_MODEL,
+            contents=full_prompt,
+        )
         return response.text
+
+    text = current_recorder().call(
+        "gemini", {"model": GEMINI_MODEL, "search": False, "prompt": full_prompt}, generate
+    )
+    if text:
+        return text
     return "응답을 생성하지 못했습니다."
 
 
 @retry(
     stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=2, min=2, max=8),
+    wait=gemini_retry_wait,
     retry=retry_if_exception_type(Exception),
     before_sleep=lambda retry_state: log.warning(
         "Gemini Search API 재시도 %d/3 (%s)",
@@ -290,40 +556,80 @@ def call_gemini_with_search(system_prompt: str, user_prompt: str) -> str:
     """Google Search Grounding이 활성화된 Gemini API 호출 (Analyst용). 실패 시 최대 3회 재시도."""
     full_prompt = f"{system_prompt}\n\n---\n\n{user_prompt}"
 
-    response = gemini_client.models.generate_content(
-        model=GEMINI_MODEL,
-        contents=full_prompt,
-        config=types.GenerateContentConfig(
-            tools=[types.Tool(google_search=types.GoogleSearch())],
-        ),
-    )
-
-    if response.text:
+    def generate() -> str | None:
+        response = gemini_client.models.generate_content(
+            model=GEMINI_MODEL,
+            contents=full_prompt,
+            config=types.GenerateContentConfig(
+                tools=[types.Tool(google_search=types.GoogleSearch())],
+            ),
+        )
         return response.text
+
+    text = current_recorder().call(
+        "gemini", {"model": GEMINI_MODEL, "search": True, "prompt": full_prompt}, generate
+    )
+    if text:
+        return text
     return "응답을 생성하지 못했습니다."
 
 
 # ============================================================
 # 📄 리포트 자동 저장
 # ============================================================
-def save_report(current_datetime: str, market_analysis: str, proposed_orders: str, final_message: str) -> Path:
-    """파이프라인 결과를 reports/YYYY-MM-DD_HH-MM.md로 저장."""
-    REPORTS_DIR.mkdir(exist_ok=True)
-    filename = current_datetime.replace(" ", "_").replace(":", "-") + ".md"
-    report_path = REPORTS_DIR / filename
-
+def save_report(
+    current_datetime: str,
+    market_analysis: str,
+    proposed_orders: str,
+    final_message: str,
+    strategy: str | None = None,
+    backfill: bool = False,
+) -> Path:
+    """
+    파이프라인 결과를 reports/YYYY-MM-DD_HH-MM.md (전략 지정 시 _<strategy> 접미사)로 저장.
+    backfill이면 reports/backfill/ 아래에 저장하고, 기존 파일은 덮어쓰지 않고 _2, _3… 번호를 붙인다.
+    """
+    directory = REPORTS_DIR / "backfill" if backfill else REPORTS_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    suffix = f"_{strategy}" if strategy else ""
+    stem = current_datetime.replace(" ", "_").replace(":", "-") + suffix
+
+    title = f"# Trading Report — {current_datetime} KST" + (f" ({strategy})" if strategy else "")
+    if backfill:
+        generated_at = datetime.now(KST).strftime("%Y-%m-%d %H:%M")
+        title += (
+            f"\n\n> ⚠️ **Backfill 리포트** — {current_datetime[:10]} 일봉(종가) 기준 KIS 지수/수급과 "
+            f"매크로 종가로 {generated_at} KST에 생성되었습니다. "
+            "장중 시각별 데이터와 웹 검색(뉴스)은 반영되지 않았습니다."
+        )
     content = (
-        f"# Trading Report — {current_datetime} KST\n\n"
+        f"{title}\n\n"
         f"## 1. Market Analysis\n{market_analysis}\n\n"
         f"## 2. Proposed Orders (JSON)\n```json\n{proposed_orders}\n```\n\n"
         f"## 3. Risk Assessment & Telegram Message\n{final_message}\n"
     )
 
-    report_path.write_text(content, encoding="utf-8")
+    if backfill:
+        report_path = _claim_new_file(directory, stem, ".md")
+    else:
+        report_path = directory / f"{stem}.md"
+    atomic_write_text(report_path, content)
     log.info("리포트 저장 완료 → %s", report_path)
     return report_path
 
 
+def _claim_new_file(directory: Path, stem: str, ext: str) -> Path:
+    """O_EXCL로 아직 없는 파일명(stem, stem_2, stem_3, …)을 선점해 반환. 기존 파일은 절대 건드리지 않음."""
+    n = 1
+    while True:
+        path = directory / (f"{stem}{ext}" if n == 1 else f"{stem}_{n}{ext}")
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return path
+        except FileExistsError:
+            n += 1
+
+
 # ============================================================
 # 🔄 global_state.md 자동 갱신
 # ============================================================
@@ -333,6 +639,11 @@ def update_global_state(current_datetime: str, report_filename: str) -> None:
         log.warning("global_state.md를 찾을 수 없습니다: %s", GLOBAL_STATE_FILE)
         return
 
+    with _state_lock:
+        _update_global_state(current_datetime, report_filename)
+
+
+def _update_global_state(current_datetime: str, report_filename: str) -> None:
     raw = GLOBAL_STATE_FILE.read_text(encoding="utf-8")
 
     # Last Updated 갱신
@@ -355,46 +666,229 @@ def update_global_state(current_datetime: str, report_filename: str) -> None:
             f"## 📝 Recent Accomplishments\n{new_entry}",
         )
 
-    GLOBAL_STATE_FILE.write_text(raw, encoding="utf-8")
+    atomic_write_text(GLOBAL_STATE_FILE, raw)
     log.info("global_state.md 갱신 완료")
 
 
+# ============================================================
+# 📒 전략별 주문 원장
+# ============================================================
+def append_ledger(profile: StrategyProfile, current_datetime: str, proposed_orders: str, report_filename: str) -> None:
+    """ledgers/<strategy>.jsonl에 이번 회차 주문을 한 줄 추가 (live 모드 전용)."""
+    try:
+        orders = json.loads(proposed_orders)
+    except json.JSONDecodeError:
+        orders = None  # 파싱 실패도 원장에는 남김 (raw 보존)
+
+    entry = {
+        "run_at": current_datetime,
+        "strategy": profile.name,
+        "account_no": profile.account_no,
+        "orders": orders,
+        "raw": None if orders is not None else proposed_orders,
+        "report": report_filename,
+    }
+    LEDGERS_DIR.mkdir(exist_ok=True)
+    with open(LEDGERS_DIR / f"{profile.name}.jsonl", "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
 # ============================================================
 # 🔄 메인 파이프라인
 # ============================================================
-def run_pipeline() -> None:
-    """Analyst → Quant → Risk Officer → Telegram 파이프라인 실행."""
-    now_kst = datetime.now(KST)
+def active_strategies() -> list[StrategyProfile]:
+    """strategies.json 중 --strategy로 선택된 프로필 (지정 없으면 전체)."""
+    return select_strategies(load_strategies(STRATEGIES_FILE), strategy_names)
+
+
+def missing_skills(strategies: list[StrategyProfile]) -> list[Path]:
+    """Analyst와 각 전략의 Quant/Risk SKILL.md 중 존재하지 않는 파일 경로 목록."""
+    skills = {"market-analyst"}
+    for profile in strategies:
+        skills.update((profile.quant_skill, profile.risk_skill))
+    paths = [SKILLS_DIR / skill / "SKILL.md" for skill in sorted(skills)]
+    return [path for path in paths if not path.exists()]
+
+
+def new_run_recorder(now_kst: datetime, mode: str, strategies: list[StrategyProfile]) -> Recorder:
+    """record_runs가 켜져 있으면 runs/ 아래 실행별 아카이브에 기록하는 Recorder 생성."""
+    if not record_runs:
+        return Recorder()
+    prune_runs()
+    filename = f"{now_kst.strftime('%Y-%m-%d_%H-%M')}_{mode}_{time.time_ns()}.jsonl.gz"
+    meta = {
+        "run_at": now_kst.isoformat(),
+        "mode": mode,
+        "model": GEMINI_MODEL,
+        "strategies": [profile.to_dict() for profile in strategies],
+        "recorded_at": datetime.now(KST).isoformat(),
+    }
+    return RecordingRecorder(RUNS_DIR / filename, meta)
+
+
+def prune_runs() -> int:
+    """RUNS_RETENTION_DAYS보다 오래된 runs/ 아카이브 삭제. 삭제한 개수 반환."""
+    if RUNS_RETENTION_DAYS <= 0 or not RUNS_DIR.exists():
+        return 0
+
+    cutoff = time.time() - RUNS_RETENTION_DAYS * 24 * 60 * 60
+    removed = 0
+    for path in RUNS_DIR.glob("*.jsonl.gz"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            pass  # 동시에 실행 중인 다른 회차(backfill 워커 등)가 먼저 삭제
+    if removed:
+        log.info("오래된 실행 기록 %d개 삭제 (보관 기간 %d일)", removed, RUNS_RETENTION_DAYS)
+    return removed
+
+
+def run_pipeline(
+    now: datetime | None = None,
+    mode: str = MODE_LIVE,
+    recorder: Recorder | None = None,
+    strategies: list[StrategyProfile] | None = None,
+    market_data: str | None = None,
+) -> bool:
+    """
+    Analyst → Quant → Risk Officer → Telegram 파이프라인 실행. 성공 여부 반환.
+
+    mode:
+        MODE_LIVE     — 텔레그램 전송, 주문/리포트/global_state 저장
+        MODE_DRY_RUN  — 최종 메시지를 로그로만 출력 (파일/텔레그램 변경 없음)
+        MODE_BACKFILL — 리포트만 reports/backfill/에 저장 (이전 주문은 비교 대상 없음으로 처리)
+    recorder: 외부 I/O를 기록/재생할 Recorder. None이면 new_run_recorder()로 생성.
+    strategies: 실행할 전략 프로필. None이면 active_strategies() (daemon 등은 main()에서 1회 읽어 넘긴다).
+        설정 파일이 잘못되어도 예외를 밖으로 던지지 않고 로그/알림 후 False를 반환한다.
+        2개 이상이면 시장 데이터/Analyst는 1회만 실행하고 전략별 Quant → Risk 체인을 병렬 실행(fan-out).
+    market_data: 미리 만든 과거 일봉 스냅샷 (backfill, daily_market_snapshot 참고).
+        주어지면 KIS를 호출하지 않고, Analyst도 웹 검색 없이 이 데이터만으로 분석한다.
+        replay가 재현할 수 있도록 "market_data" 채널로 기록된다.
+    """
+    now_kst = now or datetime.now(KST)
+    if not strategies:
+        try:
+            strategies = active_strategies()
+        except (ValueError, TypeError) as e:
+            log.error("전략 설정 오류 (%s): %s", STRATEGIES_FILE, e)
+            if mode == MODE_LIVE:
+                send_telegram(f"⚠️ [ERROR] 전략 설정 오류로 실행하지 못했습니다!\n{e}")
+            return False
+    recorder = recorder or new_run_recorder(now_kst, mode, strategies)
+    try:
+        with use_recorder(recorder):
+            return _run_pipeline(now_kst, mode, strategies, market_data)
+    finally:
+        try:
+            recorder.close()
+        except OSError as e:
+            log.error("실행 기록 저장 실패: %s", e)
+
+
+def _run_pipeline(
+    now_kst: datetime,
+    mode: str,
+    strategies: list[StrategyProfile],
+    market_data: str | None = None,
+) -> bool:
     current_time = now_kst.strftime("%H:%M")
     current_datetime = now_kst.strftime("%Y-%m-%d %H:%M")
+    names = ", ".join(profile.name for profile in strategies)
 
     log.info("=" * 50)
-    log.info("파이프라인 시작 — %s KST", current_datetime)
+    log.info("파이프라인 시작 — %s KST (%s) [전략: %s]", current_datetime, mode, names)
     log.info("=" * 50)
 
     try:
-        # ── Step 0: 실시간 시장 데이터 수집 ──
-        log.info("[0/4] 시장 데이터 수집 중 (pykrx + FDR)...")
-        market_data = fetch_market_data()
-
-        # ── Step 1: Market Analyst (Google Search Grounding) ──
-        log.info("[1/4] Market Analyst 호출 중 (웹 검색 활성화)...")
         analyst_prompt = load_skill_prompt("market-analyst")
-        analyst_user_prompt = (
-            f"현재 한국 시간: {current_time}\n\n"
-            f"## 실시간 시장 데이터 (자동 수집)\n{market_data}\n\n"
-            f"위 데이터와 웹 검색 결과를 종합하여 오늘의 한국 주식시장 시황을 분석해주세요."
-        )
-        market_analysis = call_gemini_with_search(
-            system_prompt=analyst_prompt,
-            user_prompt=analyst_user_prompt,
-        )
+
+        if market_data is None:
+            # ── Step 0: 실시간 시장 데이터 수집 (전략 공통) ──
+            log.info("[0/4] 시장 데이터 수집 중 (KIS OpenAPI)...")
+            market_data = fetch_market_data(now_kst)
+
+            # ── Step 1: Market Analyst (Google Search Grounding, 전략 공통) ──
+            log.info("[1/4] Market Analyst 호출 중 (웹 검색 활성화)...")
+            analyst_user_prompt = (
+                f"현재 한국 시간: {current_time}\n\n"
+                f"## 실시간 시장 데이터 (자동 수집)\n{market_data}\n\n"
+                f"위 데이터와 웹 검색 결과를 종합하여 오늘의 한국 주식시장 시황을 분석해주세요."
+            )
+            market_analysis = call_gemini_with_search(
+                system_prompt=analyst_prompt,
+                user_prompt=analyst_user_prompt,
+            )
+        else:
+            # ── Step 0: 과거 일봉 스냅샷 사용 (backfill) ──
+            log.info("[0/4] 과거 일봉 데이터 사용 (%s)", now_kst.strftime("%Y-%m-%d"))
+            snapshot = market_data
+            market_data = current_recorder().call(
+                "market_data", {"date": now_kst.strftime("%Y-%m-%d")}, lambda: snapshot
+            )
+
+            # ── Step 1: Market Analyst (웹 검색 없음 — 검색 결과는 과거 시점이 아님) ──
+            log.info("[1/4] Market Analyst 호출 중 (과거 데이터, 웹 검색 없음)...")
+            analyst_user_prompt = (
+                f"기준 일자: {now_kst.strftime('%Y-%m-%d')} (과거 일봉 종가 기준)\n\n"
+                f"## 과거 시장 데이터 (일봉)\n{market_data}\n\n"
+                f"위 데이터만으로 기준 일자의 한국 주식시장 시황을 분석해주세요. "
+                f"기준 일자 이후의 정보는 사용하지 마세요."
+            )
+            market_analysis = call_gemini(
+                system_prompt=analyst_prompt,
+                user_prompt=analyst_user_prompt,
+            )
         log.info("[✓] Market Analysis 완료")
 
+    except Exception as e:
+        log.error("파이프라인 실행 중 오류 발생: %s", e, exc_info=True)
+        if mode == MODE_LIVE:
+            send_telegram(f"⚠️ [ERROR] 봇 실행 중 오류 발생!\n{e}")
+        return False
+
+    if len(strategies) == 1:
+        return run_strategy(strategies[0], market_analysis, now_kst, mode, fanout=False)
+
+    # ── Fan-out: 전략별 Quant → Risk 체인 병렬 실행 (Recorder 컨텍스트 공유) ──
+    with ThreadPoolExecutor(max_workers=len(strategies), thread_name_prefix="strategy") as pool:
+        futures = [
+            pool.submit(contextvars.copy_context().run, run_strategy, profile, market_analysis, now_kst, mode, True)
+            for profile in strategies
+        ]
+        results = [future.result() for future in futures]
+
+    log.info("fan-out 완료 — 성공 %d / 전체 %d", sum(results), len(results))
+    return all(results)
+
+
+def run_strategy(
+    profile: StrategyProfile,
+    market_analysis: str,
+    now_kst: datetime,
+    mode: str,
+    fanout: bool,
+) -> bool:
+    """
+    전략 1개의 Quant → Risk → Telegram/저장 체인.
+    fan-out 중이거나 default가 아닌 전략이면 로그/메시지/리포트 파일명에 전략명을 붙인다.
+    """
+    current_datetime = now_kst.strftime("%Y-%m-%d %H:%M")
+    labeled = fanout or not profile.is_default
+    tag = f"[{profile.name}] " if labeled else ""
+    orders_file = orders_path(profile)
+
+    try:
         # ── Step 2: Quant Strategist ──
-        log.info("[2/4] Quant Strategist 호출 중...")
-        quant_prompt = load_skill_prompt("quant-strategist")
-        previous_orders = load_previous_orders()
+        log.info("%s[2/4] Quant Strategist 호출 중...", tag)
+        quant_prompt = load_skill_prompt(profile.quant_skill)
+        # backfill은 여러 시각을 병렬로 처리하므로 live 주문 파일과 체이닝하지 않음
+        previous_orders = current_recorder().call(
+            "orders",
+            {"file": orders_file.name},
+            (lambda: "[]") if mode == MODE_BACKFILL else (lambda: load_previous_orders(orders_file)),
+        )
 
         quant_user_prompt = (
             f"## Market Analysis (from Analyst)\n{market_analysis}\n\n"
@@ -407,11 +901,11 @@ def run_pipeline() -> None:
             user_prompt=quant_user_prompt,
         )
         proposed_orders = parse_json_from_response(proposed_orders_raw)
-        log.info("[✓] Quant Strategy 완료")
+        log.info("%s[✓] Quant Strategy 완료", tag)
 
         # ── Step 3: Risk Officer ──
-        log.info("[3/4] Risk Officer 호출 중...")
-        risk_prompt = load_skill_prompt("risk-officer")
+        log.info("%s[3/4] Risk Officer 호출 중...", tag)
+        risk_prompt = load_skill_prompt(profile.risk_skill)
 
         risk_user_prompt = (
             f"## Proposed Orders (from Quant)\n```json\n{proposed_orders}\n```\n\n"
@@ -423,22 +917,39 @@ def run_pipeline() -> None:
             system_prompt=risk_prompt,
             user_prompt=risk_user_prompt,
         )
-        log.info("[✓] Risk Assessment 완료")
+        log.info("%s[✓] Risk Assessment 완료", tag)
 
         # ── Step 4: 텔레그램 전송 & 저장 ──
-        log.info("[4/4] 결과 전송 및 저장...")
-        send_telegram(final_message)
-        save_orders(proposed_orders)
+        if mode == MODE_DRY_RUN:
+            log.info("%s[4/4] dry-run — 전송/저장 생략. 최종 메시지:\n%s", tag, final_message)
+            log.info("%sdry-run 완료 — %s KST", tag, current_datetime)
+            return True
+
+        report_path = save_report(
+            current_datetime, market_analysis, proposed_orders, final_message,
+            strategy=profile.name if labeled else None,
+            backfill=mode == MODE_BACKFILL,
+        )
+        if mode == MODE_BACKFILL:
+            log.info("%sbackfill 완료 — %s KST", tag, current_datetime)
+            return True
 
-        # ── Step 5: 리포트 저장 & global_state 갱신 ──
-        report_path = save_report(current_datetime, market_analysis, proposed_orders, final_message)
+        log.info("%s[4/4] 결과 전송 및 저장...", tag)
+        send_telegram(f"📌 [{profile.name}]\n{final_message}" if labeled else final_message)
+        save_orders(proposed_orders, orders_file)
+        append_ledger(profile, current_datetime, proposed_orders, report_path.name)
+
+        # ── Step 5: global_state 갱신 ──
         update_global_state(current_datetime, report_path.name)
 
-        log.info("파이프라인 성공적으로 완료 — %s KST", current_datetime)
+        log.info("%s파이프라인 성공적으로 완료 — %s KST", tag, current_datetime)
+        return True
 
     except Exception as e:
-        log.error("파이프라인 실행 중 오류 발생: %s", e, exc_info=True)
-        send_telegram(f"⚠️ [ERROR] 봇 실행 중 오류 발생!\n{e}")
+        log.error("%s파이프라인 실행 중 오류 발생: %s", tag, e, exc_info=True)
+        if mode == MODE_LIVE:
+            send_telegram(f"⚠️ [ERROR] {tag}봇 실행 중 오류 발생!\n{e}")
+        return False
 
 
 # ============================================================
@@ -463,39 +974,240 @@ def is_market_closed(now: datetime) -> str | None:
     return None
 
 
-def job():
-    """스케줄러에 의해 실행되는 작업 함수."""
+def run_locked(
+    now: datetime | None = None,
+    mode: str = MODE_LIVE,
+    strategies: list[StrategyProfile] | None = None,
+) -> bool:
+    """pipeline_lock을 잡은 상태에서 run_pipeline 실행. 이미 실행 중이면 스킵."""
+    with pipeline_lock() as acquired:
+        if not acquired:
+            log.warning("이전 파이프라인이 아직 실행 중입니다. 이번 회차는 스킵합니다. (%s)", LOCK_FILE)
+            return False
+        return run_pipeline(now, mode, strategies=strategies)
+
+
+def job(strategies: list[StrategyProfile] | None = None):
+    """스케줄러에 의해 실행되는 작업 함수. strategies는 daemon 시작 시 검증된 프로필."""
     now = datetime.now(KST)
     reason = is_market_closed(now)
     if reason:
         log.info("스킵 — %s", reason)
         return
-    run_pipeline()
+    run_locked(now, strategies=strategies)
+
+
+def backfill_timestamps(start: datetime, end: datetime) -> list[datetime]:
+    """
+    start ~ end 사이 장이 열린 날짜마다 시각 1개 (그 날 범위 안의 마지막 정각).
+    backfill 데이터는 일봉 단위라 같은 날의 여러 정각은 같은 리포트가 되므로 하나로 합친다.
+    """
+    ts = start.replace(minute=0, second=0, microsecond=0)
+    if ts < start:
+        ts += timedelta(hours=1)
+
+    by_date = {}
+    while ts <= end:
+        if not is_market_closed(ts):
+            by_date[ts.date()] = ts
+        ts += timedelta(hours=1)
+    return list(by_date.values())
+
+
+def run_backfill(
+    start: datetime,
+    end: datetime,
+    workers: int,
+    strategies: list[StrategyProfile] | None = None,
+) -> int:
+    """과거 거래일들을 일봉 데이터 기준으로 병렬 처리. 실패한 회차 수 반환."""
+    timestamps = backfill_timestamps(start, end)
+    if not timestamps:
+        log.info("backfill 대상 시각이 없습니다. (%s ~ %s)", start, end)
+        return 0
+
+    # KIS/매크로 조회는 여기서 1회만 (토큰 1개, 호출 간격 유지). 워커는 Gemini만 호출한다
+    try:
+        history = fetch_daily_history(timestamps[0].date(), timestamps[-1].date())
+    except Exception as e:
+        log.error("backfill 중단 — 과거 데이터 수집 실패: %s", e)
+        return len(timestamps)
+
+    snapshots = {}
+    for ts in timestamps:
+        snapshot = daily_market_snapshot(history, ts)
+        if snapshot is None:
+            log.warning("%s 일봉 데이터가 없어 건너뜁니다 (휴장일이거나 KIS 제공 범위 밖)", ts.strftime("%Y-%m-%d"))
+            continue
+        snapshots[ts] = snapshot
+    if not snapshots:
+        log.error("backfill 중단 — 대상 기간의 일봉 데이터가 없습니다. (%s ~ %s)", start, end)
+        return len(timestamps)
+
+    log.info("backfill 시작 — %d개 거래일, 워커 %d개", len(snapshots), workers)
+    failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(run_pipeline, ts, MODE_BACKFILL, strategies=strategies, market_data=snapshot): ts
+            for ts, snapshot in snapshots.items()
+        }
+        for future in as_completed(futures):
+            if not future.result():
+                failed += 1
+                log.error("backfill 실패 — %s", futures[future].strftime("%Y-%m-%d %H:%M"))
+
+    skipped = len(timestamps) - len(snapshots)
+    log.info("backfill 종료 — 성공 %d / 실패 %d / 건너뜀 %d", len(snapshots) - failed, failed, skipped)
+    return failed
+
+
+def run_daemon(strategies: list[StrategyProfile] | None = None) -> None:
+    """
+    매 정각 job 실행. SIGINT/SIGTERM 수신 시 진행 중인 회차를 마치고 종료.
+    strategies.json은 시작 시 1회만 읽으므로, 실행 중 설정을 고쳐도 재시작 전까지는 반영되지 않는다.
+    """
+    def handle_signal(signum, frame):
+        log.info("종료 신호 수신 (%s) — 현재 작업 완료 후 종료합니다.", signal.Signals(signum).name)
+        shutdown_event.set()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    # 매 시간 정각에 실행 예약
+    schedule.every().hour.at(":00").do(job, strategies)
+
+    log.info("스케줄러 가동 중... (매 정각 실행)")
+
+    while not shutdown_event.is_set():
+        schedule.run_pending()
+        shutdown_event.wait(1)
+
+    schedule.clear()
+    log.info("스케줄러 종료")
 
 
-def main():
+def run_replay(archive: Path, strict: bool = False) -> int:
+    """아카이브의 run_at 시각으로 dry-run 파이프라인을 재생. 기록과 다른 호출 수를 보고."""
+    recorder = ReplayRecorder.load(archive, strict=strict)
+    now = datetime.fromisoformat(recorder.meta["run_at"])
+    log.info("재생 시작 — %s (기록 모드: %s)", archive.name, recorder.meta.get("mode"))
+
+    # 기록 당시의 전략 프로필을 아카이브에서 복원 (현재 strategies.json은 읽지 않음)
+    try:
+        strategies = [StrategyProfile(**item) for item in recorder.meta.get("strategies", [])]
+    except TypeError as e:
+        log.error("아카이브의 전략 정보를 읽을 수 없습니다 (%s): %s", archive.name, e)
+        return 2
+    strategies = strategies or [DEFAULT_STRATEGY]
+
+    # backfill 기록은 스냅샷이 "market_data" 채널에 있으므로 같은 경로(웹 검색 없는 Analyst)로 재생
+    market_data = "" if recorder.meta.get("mode") == MODE_BACKFILL else None
+
+    started = time.perf_counter()
+    ok = run_pipeline(now, MODE_DRY_RUN, recorder=recorder, strategies=strategies, market_data=market_data)
+    elapsed = time.perf_counter() - started
+
+    if recorder.divergences:
+        log.warning("기록과 다른 요청 %d건: %s", len(recorder.divergences), recorder.divergences)
+    log.info("재생 종료 — %.2fs, 미사용 응답 %d건", elapsed, recorder.remaining())
+    return 0 if ok else 1
+
+
+def parse_kst(value: str) -> datetime:
+    """'YYYY-MM-DD HH:MM' (또는 'YYYY-MM-DD') 문자열을 KST datetime으로 변환."""
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt).replace(tzinfo=KST)
+        except ValueError:
+            continue
+    raise argparse.ArgumentTypeError(f"시각 형식이 올바르지 않습니다 (YYYY-MM-DD HH:MM): {value}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.main_bot", description="KRX Auto-Trading Bot")
+    sub = parser.add_subparsers(dest="command")
+
+    sub.add_parser("daemon", help="매 정각 스케줄 실행 (기본값)")
+    sub.add_parser("run-once", help="장 시간과 무관하게 파이프라인 1회 실행")
+    sub.add_parser("dry-run", help="1회 실행, 텔레그램 전송 및 주문/상태 파일 저장 생략")
+
+    backfill = sub.add_parser("backfill", help="과거 시각 기준 리포트 일괄 생성")
+    backfill.add_argument("--from", dest="start", type=parse_kst, required=True, help="시작 시각 (KST)")
+    backfill.add_argument("--to", dest="end", type=parse_kst, required=True, help="종료 시각 (KST)")
+    backfill.add_argument("--workers", type=int, default=4, help="병렬 워커 수 (기본 4)")
+
+    replay = sub.add_parser("replay", help="기록된 실행을 네트워크 없이 재생 (dry-run으로 실행)")
+    replay.add_argument("archive", type=Path, help="runs/*.jsonl.gz 아카이브 경로")
+    replay.add_argument("--strict", action="store_true", help="요청이 기록과 다르면 실패 처리")
+
+    for subparser in sub.choices.values():
+        subparser.add_argument("--no-record", action="store_true", help="외부 I/O 기록 끄기")
+    for name in ("daemon", "run-once", "dry-run", "backfill"):
+        sub.choices[name].add_argument(
+            "--strategy", action="append", default=[], metavar="NAME",
+            help="실행할 전략 (반복 지정 가능, 기본: strategies.json 전체)",
+        )
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
     """프로그램 진입점."""
-    global gemini_client
+    args = build_parser().parse_args(argv)
+    command = args.command or "daemon"
+
+    global gemini_client, record_runs, strategy_names
+    record_runs = not getattr(args, "no_record", False)
+    strategy_names = getattr(args, "strategy", [])
+
+    # replay는 아카이브에 저장된 전략 프로필을 쓰므로 현재 설정을 검사하지 않음
+    if command == "replay":
+        return run_replay(args.archive, args.strict)
+
+    try:
+        strategies = active_strategies()
+    except (ValueError, TypeError) as e:
+        log.error("전략 설정 오류 (%s): %s", STRATEGIES_FILE, e)
+        return 2
+    missing = missing_skills(strategies)
+    if missing:
+        log.error("SKILL.md를 찾을 수 없습니다: %s", ", ".join(str(path) for path in missing))
+        return 2
+
+    if not GEMINI_API_KEY:
+        log.error("GEMINI_API_KEY가 설정되지 않았습니다.")
+        return 2
+    if command in ("daemon", "run-once") and not (TELEGRAM_TOKEN and TELEGRAM_CHAT_ID):
+        log.error("TELEGRAM_TOKEN / TELEGRAM_CHAT_ID가 설정되지 않았습니다. (%s 모드는 알림 전송이 필수)", command)
+        return 2
     gemini_client = genai.Client(api_key=GEMINI_API_KEY)
 
     log.info("=" * 50)
-    log.info("KRX Auto-Trading Bot v4.0")
+    log.info("KRX Auto-Trading Bot v4.0 — %s", command)
     log.info("Model: %s", GEMINI_MODEL)
     log.info("Target: KOSPI/KOSDAQ (09:00 ~ 15:30)")
+    log.info("Strategies: %s", ", ".join(profile.name for profile in strategies))
     log.info("=" * 50)
 
-    # 테스트를 위해 시작하자마자 1회 실행 (원치 않으면 주석 처리)
-    # run_pipeline()
-
-    # 매 시간 정각에 실행 예약
-    schedule.every().hour.at(":00").do(job)
-
-    log.info("스케줄러 가동 중... (매 정각 실행)")
-
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+    if command == "run-once":
+        return 0 if run_locked(strategies=strategies) else 1
+    if command == "dry-run":
+        return 0 if run_pipeline(mode=MODE_DRY_RUN, strategies=strategies) else 1
+    if command == "backfill":
+        if args.start > args.end:
+            log.error("--from이 --to보다 늦습니다.")
+            return 2
+        # backfill은 reports/backfill/과 자체 아카이브에만 쓰므로 live 락을 잡지 않는다
+        # (잡으면 긴 backfill 동안 daemon의 정각 실행이 스킵됨). 동시 backfill만 막는다.
+        with pipeline_lock(BACKFILL_LOCK_FILE) as acquired:
+            if not acquired:
+                log.error("다른 backfill이 실행 중입니다. (%s)", BACKFILL_LOCK_FILE)
+                return 1
+            return 0 if run_backfill(args.start, args.end, max(1, args.workers), strategies) == 0 else 1
+
+    run_daemon(strategies)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
@@ -0,0 +1,165 @@
+"""
+Run Recorder — 외부 I/O(KIS, 매크로, Gemini, Telegram) 기록/재생.
+
+- Recorder          : 기본값. 그대로 실행 (기록 없음)
+- RecordingRecorder : 모든 요청/응답을 runs/*.jsonl.gz 아카이브로 저장
+- ReplayRecorder    : 아카이브에서 응답을 순서대로 꺼내 반환 (네트워크 없음)
+
+호출부는 current_recorder().call(channel, request, fn) 형태로 감싸기만 하면 되고,
+어떤 Recorder가 활성화될지는 run_pipeline이 use_recorder()로 결정한다.
+ContextVar를 사용하므로 backfill 워커 스레드마다 독립적인 Recorder를 가진다.
+전략 fan-out처럼 한 실행 안에서 여러 스레드가 같은 Recorder를 쓰는 경우
+contextvars.copy_context()로 컨텍스트를 넘기면 되고, Recorder는 스레드 안전하다.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from src.fileio import atomic_write
+
+ARCHIVE_VERSION = 1
+
+
+def request_hash(channel: str, request) -> str:
+    """채널 + 요청 내용의 안정적인 해시 (키 정렬 JSON 기준)."""
+    raw = json.dumps([channel, request], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class ReplayMissError(KeyError):
+    """재생할 응답이 아카이브에 없음 (코드 경로가 기록 당시보다 더 많은 호출을 함)."""
+
+
+class RecordedError(RuntimeError):
+    """기록 당시 발생했던 예외를 재생 시 다시 발생시킬 때 사용."""
+
+
+class Recorder:
+    """기록하지 않는 기본 Recorder. fn()을 그대로 실행."""
+    replaying = False
+
+    def call(self, channel: str, request, fn):
+        return fn()
+
+    def close(self) -> None:
+        pass
+
+
+class RecordingRecorder(Recorder):
+    """fn()의 결과(JSON 직렬화 가능해야 함)를 기록하고, close() 시 gzip JSONL로 저장."""
+
+    def __init__(self, path: Path, meta: dict):
+        self.path = Path(path)
+        self.meta = meta
+        self.entries = []
+        self._seq = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def call(self, channel: str, request, fn):
+        entry = {
+            "type": "call",
+            "channel": channel,
+            "request": request,
+            "request_hash": request_hash(channel, request),
+            "response": None,
+        }
+        with self._lock:
+            entry["seq"] = self._seq[channel]
+            self._seq[channel] += 1
+            self.entries.append(entry)
+
+        started = time.perf_counter()
+        try:
+            entry["response"] = fn()
+        except Exception as e:
+            # 실패도 기록해야 재생 시 재시도/에러 경로가 같은 순서로 재현된다
+            entry["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            entry["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return entry["response"]
+
+    def close(self) -> None:
+        """아카이브를 원자적으로 저장 (src.fileio.atomic_write)."""
+        header = {"type": "meta", "version": ARCHIVE_VERSION, **self.meta}
+        with atomic_write(self.path, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+            for line in [header, *self.entries]:
+                f.write(json.dumps(line, ensure_ascii=False, default=str) + "\n")
+
+
+class ReplayRecorder(Recorder):
+    """
+    아카이브의 응답을 반환. fn()은 호출하지 않는다.
+    같은 요청 해시를 가진 가장 오래된 기록을 우선 사용하므로 동시 실행으로 순서가 섞여도 맞게 재생되고,
+    일치하는 기록이 없으면(프롬프트/SKILL 변경 등) 채널의 다음 기록을 반환하며 divergences에 남긴다.
+    strict=True이면 이 경우 ReplayMissError를 발생시킨다.
+    """
+    replaying = True
+
+    def __init__(self, meta: dict, entries: list, strict: bool = False):
+        self.meta = meta
+        self.strict = strict
+        self.divergences = []
+        self._lock = threading.Lock()
+        self._queues = defaultdict(deque)
+        for entry in entries:
+            self._queues[entry["channel"]].append(entry)
+
+    @classmethod
+    def load(cls, path: Path, strict: bool = False) -> "ReplayRecorder":
+        meta, entries = {}, []
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                if record["type"] == "meta":
+                    meta = record
+                else:
+                    entries.append(record)
+        return cls(meta, entries, strict=strict)
+
+    def call(self, channel: str, request, fn):
+        wanted = request_hash(channel, request)
+        with self._lock:
+            queue = self._queues[channel]
+            if not queue:
+                raise ReplayMissError(f"아카이브에 남은 '{channel}' 응답이 없습니다.")
+
+            entry = next((e for e in queue if e["request_hash"] == wanted), None)
+            if entry is None:
+                if self.strict:
+                    raise ReplayMissError(f"'{channel}' #{queue[0]['seq']} 요청이 기록과 다릅니다.")
+                entry = queue[0]
+                self.divergences.append((channel, entry["seq"]))
+            queue.remove(entry)
+        if "error" in entry:
+            raise RecordedError(entry["error"])
+        return entry["response"]
+
+    def remaining(self) -> int:
+        """재생되지 않고 남은 응답 수."""
+        with self._lock:
+            return sum(len(q) for q in self._queues.values())
+
+
+_current: ContextVar[Recorder] = ContextVar("recorder", default=Recorder())
+
+
+def current_recorder() -> Recorder:
+    return _current.get()
+
+
+@contextmanager
+def use_recorder(recorder: Recorder):
+    """with 블록 안에서 current_recorder()가 recorder를 반환하도록 설정."""
+    token = _current.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current.reset(token)
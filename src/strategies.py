@@ -0,0 +1,81 @@
+"""
+Strategy Profiles — 전략(Quant/Risk SKILL) × 계좌 조합 정의.
+
+.agent/strategies.json에 프로필 목록을 정의한다. 파일이 없으면 기본 프로필 1개로 동작.
+
+    [
+      {"name": "default"},
+      {"name": "scalping", "quant_skill": "quant-scalper", "account_env": "KIS_ACCOUNT_NO_SCALPING"},
+      {"name": "swing", "quant_skill": "quant-swing", "account_env": "KIS_ACCOUNT_NO_SWING"}
+    ]
+
+프로필이 여러 개면 시장 데이터 수집과 Market Analyst는 1회만 실행하고
+전략별 Quant → Risk 체인을 병렬로 실행한다 (main_bot.run_pipeline 참고).
+
+계좌(account_env)는 현재 주문 원장(ledgers/<name>.jsonl)에 기록하는 용도로만 쓰인다.
+봇은 계좌와 무관한 시세만 조회하고 주문을 넣지 않으므로, KIS 세션(KisAuth, 토큰)은
+모든 전략이 1개를 공유한다. 계좌별 주문 API를 붙일 때 전략별 세션이 필요해진다.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+DEFAULT_STRATEGY_NAME = "default"
+_NAME_PATTERN = re.compile(r"^[a-z0-9][a-z0-9_-]*$")
+
+
+@dataclass(frozen=True)
+class StrategyProfile:
+    """전략 1개. name은 주문 파일/원장 파일명으로도 쓰인다."""
+    name: str
+    quant_skill: str = "quant-strategist"
+    risk_skill: str = "risk-officer"
+    account_env: str = "KIS_ACCOUNT_NO"  # 계좌번호를 담은 환경변수 이름 (원장 기록용)
+
+    @property
+    def account_no(self) -> str | None:
+        return os.getenv(self.account_env)
+
+    @property
+    def is_default(self) -> bool:
+        return self.name == DEFAULT_STRATEGY_NAME
+
+    def to_dict(self):
+        return asdict(self)
+
+
+DEFAULT_STRATEGY = StrategyProfile(DEFAULT_STRATEGY_NAME)
+
+
+def load_strategies(path: Path) -> list[StrategyProfile]:
+    """strategies.json을 읽어 프로필 목록 반환. 파일이 없으면 [DEFAULT_STRATEGY]."""
+    if not path.exists():
+        return [DEFAULT_STRATEGY]
+
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(raw, list) or not raw:
+        raise ValueError(f"전략 설정은 비어 있지 않은 리스트여야 합니다: {path}")
+
+    profiles = [StrategyProfile(**item) for item in raw]
+    names = [p.name for p in profiles]
+    for name in names:
+        if not _NAME_PATTERN.match(name):
+            raise ValueError(f"전략 이름은 소문자/숫자/-/_만 사용할 수 있습니다: {name!r}")
+    if len(set(names)) != len(names):
+        raise ValueError(f"중복된 전략 이름이 있습니다: {names}")
+    return profiles
+
+
+def select_strategies(profiles: list[StrategyProfile], names: list[str] | None) -> list[StrategyProfile]:
+    """names에 해당하는 프로필만 (설정 순서대로) 반환. names가 비어 있으면 전체."""
+    if not names:
+        return profiles
+
+    known = {p.name for p in profiles}
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        raise ValueError(f"알 수 없는 전략: {unknown} (설정된 전략: {sorted(known)})")
+    return [p for p in profiles if p.name in names]